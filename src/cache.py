@@ -82,6 +82,10 @@ class _DriftCacheStore:
 _drift_cache = _DriftCacheStore()
 
 
+# Digest of empty content, reused for modules that have no documentation yet
+_EMPTY_CONTENT_HASH = hashlib.sha256(b"").hexdigest()
+
+
 def _hash_content(content: str | None) -> str:
     """
     Computes a SHA256 hash of the given content string.
@@ -94,9 +98,9 @@ def _hash_content(content: str | None) -> str:
     Returns:
         A hexadecimal string representation of the SHA256 hash.
     """
-    if content is None:
-        # Use empty string for None to create a consistent hash
-        content = ""
+    if not content:
+        # None and empty content share one precomputed hash
+        return _EMPTY_CONTENT_HASH
     return hashlib.sha256(content.encode()).hexdigest()
 
 
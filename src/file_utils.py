@@ -6,18 +6,36 @@ from pathlib import Path
 from src.constants import ERROR_CANNOT_CREATE_DIR, ERROR_NOT_IN_GIT_REPO
 from src.doctypes import DocType
 
+# Repository roots already found, keyed by resolved start directory. Only
+# successful lookups are kept, so a repository created later is still found.
+_repo_roots: dict[Path, str] = {}
+
 
 def find_repo_root(start_path: str) -> str | None:
     """
     Find the repository root by searching for .git directory.
 
+    Found roots are cached per resolved start directory, since the same search
+    repeats for every module processed in a run.
+
     Args:
         start_path: Path to start searching from.
 
     Returns:
         Path to repository root, or None if not found.
     """
-    current = Path(start_path).resolve()
+    start = Path(start_path).resolve()
+    if start not in _repo_roots:
+        repo_root = _find_repo_root_from(start)
+        if repo_root is None:
+            return None
+        _repo_roots[start] = repo_root
+    return _repo_roots[start]
+
+
+def _find_repo_root_from(start: Path) -> str | None:
+    """Searches up the directory tree from a resolved path for a .git entry."""
+    current = start
 
     # Search up the directory tree
     while current != current.parent:
@@ -28,6 +46,16 @@ def find_repo_root(start_path: str) -> str | None:
     return None
 
 
+def clear_repo_root_cache() -> None:
+    """
+    Clears the cached repository root lookups.
+
+    This is useful for testing or when a repository is moved or removed
+    while the process is running.
+    """
+    _repo_roots.clear()
+
+
 def resolve_output_path(*, doc_type: DocType, module_path: str) -> str:
     """
     Resolve output path for documentation file.
@@ -76,7 +104,7 @@ def ensure_output_directory(output_path: str) -> None:
         PermissionError: If cannot create the directory.
     """
     parent_dir = os.path.dirname(output_path)
-    if parent_dir and not os.path.exists(parent_dir):
+    if parent_dir and not os.path.isdir(parent_dir):
         try:
             os.makedirs(parent_dir, exist_ok=True)
         except (PermissionError, OSError) as e:
@@ -9,6 +9,7 @@ This submodule provides:
 from src.llm.llm import (
     GenerationConfig,
     check_drift,
+    clear_llm_cache,
     fix_doc_incrementally,
     generate_doc,
     initialize_llm,
@@ -42,6 +43,7 @@ __all__ = [
     "build_generation_prompt",
     "build_human_intent_section",
     "check_drift",
+    "clear_llm_cache",
     "fix_doc_incrementally",
     "generate_doc",
     "initialize_llm",
@@ -1,13 +1,13 @@
 """LLM client initialization and operations."""
 
 import os
+from collections.abc import Callable
 from dataclasses import dataclass
+from typing import TypeVar, cast
 
 from llama_index.core.llms import LLM
-from llama_index.core.program import LLMTextCompletionProgram
-from llama_index.llms.anthropic import Anthropic
-from llama_index.llms.google_genai import GoogleGenAI
-from llama_index.llms.openai import OpenAI
+from llama_index.core.llms.function_calling import FunctionCallingLLM
+from llama_index.core.program import FunctionCallingProgram, LLMTextCompletionProgram
 from pydantic import BaseModel
 
 from src.cache import _generate_cache_key, content_based_cache
@@ -18,10 +18,12 @@ from src.llm.prompt_builder import build_custom_prompt_section, build_generation
 from src.llm.prompts import DRIFT_CHECK_PROMPT, INCREMENTAL_FIX_PROMPT
 from src.records import DocumentationDriftCheck, IncrementalDocumentationFix
 
+T = TypeVar("T", bound=BaseModel)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class GenerationConfig:
-    """Configuration for documentation generation."""
+    """Configuration for documentation generation (immutable once built)."""
 
     custom_prompts: CustomPrompts | None = None
     doc_type: DocType | None = None
@@ -29,6 +31,50 @@ class GenerationConfig:
     drift_rationale: str | None = None
 
 
+def _create_anthropic_llm() -> LLM:
+    """Create a Claude client, importing the Anthropic SDK only when selected."""
+    from llama_index.llms.anthropic import Anthropic  # noqa: PLC0415
+
+    # Using Claude 3.5 Haiku for fast, cost-effective structured output
+    return Anthropic(
+        model="claude-3-5-haiku-20241022",
+        temperature=LLM_TEMPERATURE,
+        max_tokens=8192,
+    )
+
+
+def _create_openai_llm() -> LLM:
+    """Create an OpenAI client, importing the OpenAI SDK only when selected."""
+    from llama_index.llms.openai import OpenAI  # noqa: PLC0415
+
+    # Using GPT-4o-mini for good balance of speed, cost, and quality
+    return OpenAI(model="gpt-4o-mini", temperature=LLM_TEMPERATURE)
+
+
+def _create_google_llm() -> LLM:
+    """Create a Gemini client, importing the Google GenAI SDK only when selected."""
+    from llama_index.llms.google_genai import GoogleGenAI  # noqa: PLC0415
+
+    # Using Gemini-2.5-Flash for speed, cost, and context balance
+    return GoogleGenAI(model="gemini-2.5-flash", temperature=LLM_TEMPERATURE)
+
+
+# LLM providers in priority order: the first one with an API key set is used.
+# Provider SDKs are imported lazily by each factory, so only the selected SDK
+# pays its (substantial) import cost.
+_LLM_PROVIDERS: tuple[tuple[str, Callable[[], LLM]], ...] = (
+    ("ANTHROPIC_API_KEY", _create_anthropic_llm),
+    ("OPENAI_API_KEY", _create_openai_llm),
+    ("GOOGLE_API_KEY", _create_google_llm),
+)
+
+# Clients already created in this process, keyed by API key env var, with the
+# key value each was created with. Reusing a client keeps its HTTP connection
+# pool (and TLS sessions) alive across modules in multi-module runs instead of
+# reconnecting for every module.
+_llm_clients: dict[str, tuple[str, LLM]] = {}
+
+
 def initialize_llm() -> LLM:
     """
     Initializes the LLM client based on available API keys.
@@ -38,32 +84,73 @@ def initialize_llm() -> LLM:
     2. OPENAI_API_KEY -> OpenAI (gpt-4o-mini)
     3. GOOGLE_API_KEY -> Google Gemini (gemini-2.5-flash)
 
+    The client is created once per provider and reused by later calls, so
+    its HTTP connections are shared across modules. A new client is created
+    when the API key value changes. Use clear_llm_cache() to force a fresh
+    client.
+
     Returns:
         LLM: The initialized LLM client.
 
     Raises:
         ValueError: If no API key is found.
     """
-    # Check for Anthropic/Claude API key
-    if os.getenv("ANTHROPIC_API_KEY"):
-        # Using Claude 3.5 Haiku for fast, cost-effective structured output
-        return Anthropic(
-            model="claude-3-5-haiku-20241022",
-            temperature=LLM_TEMPERATURE,
-            max_tokens=8192,
-        )
+    for env_var, create_llm in _LLM_PROVIDERS:
+        api_key = os.getenv(env_var)
+        if api_key:
+            cached = _llm_clients.get(env_var)
+            if cached is None or cached[0] != api_key:
+                cached = _llm_clients[env_var] = (api_key, create_llm())
+            return cached[1]
 
-    # Check for OpenAI API key
-    if os.getenv("OPENAI_API_KEY"):
-        # Using GPT-4o-mini for good balance of speed, cost, and quality
-        return OpenAI(model="gpt-4o-mini", temperature=LLM_TEMPERATURE)
+    raise ValueError(ERROR_NO_API_KEY)
 
-    # Check for Google API key
-    if os.getenv("GOOGLE_API_KEY"):
-        # Using Gemini-2.5-Flash for speed, cost, and context balance
-        return GoogleGenAI(model="gemini-2.5-flash", temperature=LLM_TEMPERATURE)
 
-    raise ValueError(ERROR_NO_API_KEY)
+def clear_llm_cache() -> None:
+    """
+    Clears the cached LLM clients.
+
+    This is useful for testing or when API keys change and initialize_llm()
+    should create a fresh client.
+    """
+    _llm_clients.clear()
+
+
+def _create_structured_program(
+    *, output_cls: type[T], llm: LLM, prompt_template_str: str
+) -> Callable[..., T]:
+    """
+    Creates a program that returns validated Pydantic output from the LLM.
+
+    Models with native tool calling (Claude, GPT-4o, Gemini) receive the output
+    schema as a tool and return structured arguments directly, which avoids
+    parsing JSON out of free-form completion text. Other models fall back to
+    LLMTextCompletionProgram.
+
+    Args:
+        output_cls: Pydantic model class for structured output.
+        llm: The LLM client instance.
+        prompt_template_str: Prompt template string to use.
+
+    Returns:
+        A program that, when called with the template variables, returns an
+        instance of output_cls.
+    """
+    if isinstance(llm, FunctionCallingLLM) and llm.metadata.is_function_calling_model:
+        # Parallel tool calls are off by default, so the program returns a
+        # single output_cls instance rather than a list
+        program = FunctionCallingProgram.from_defaults(
+            output_cls=output_cls,
+            llm=llm,
+            prompt_template_str=prompt_template_str,
+        )
+        return cast(Callable[..., T], program)
+
+    return LLMTextCompletionProgram.from_defaults(
+        output_cls=output_cls,
+        llm=llm,
+        prompt_template_str=prompt_template_str,
+    )
 
 
 @content_based_cache(cache_key_fn=_generate_cache_key)
@@ -93,8 +180,8 @@ def check_drift(
     # Convert None to a message for the prompt
     doc_for_prompt = current_doc or "No existing documentation provided."
 
-    # Use LLMTextCompletionProgram for structured Pydantic output
-    check_program = LLMTextCompletionProgram.from_defaults(
+    # Use a structured program for validated Pydantic output
+    check_program = _create_structured_program(
         output_cls=DocumentationDriftCheck,
         llm=llm,
         prompt_template_str=DRIFT_CHECK_PROMPT,
@@ -119,28 +206,28 @@ def generate_doc(
         llm: The LLM client instance.
         context: The code context to generate documentation from.
         config: Generation configuration (custom prompts, intent, drift info).
-               If None, uses default empty configuration.
+               If None, the code context is used as-is with no extra sections.
         output_model: Pydantic model class for structured output.
         prompt_template: Prompt template string to use.
 
     Returns:
         An instance of output_model with structured documentation data.
     """
-    # Use default config if none provided
     if config is None:
-        config = GenerationConfig()
-
-    # Build complete prompt from components
-    combined_context, combined_intent_section = build_generation_prompt(
-        context=context,
-        custom_prompts=config.custom_prompts,
-        doc_type=config.doc_type,
-        human_intent=config.human_intent,
-        drift_rationale=config.drift_rationale,
-    )
+        # Nothing to add to the prompt, so skip prompt assembly entirely
+        combined_context, combined_intent_section = context, ""
+    else:
+        # Build complete prompt from components
+        combined_context, combined_intent_section = build_generation_prompt(
+            context=context,
+            custom_prompts=config.custom_prompts,
+            doc_type=config.doc_type,
+            human_intent=config.human_intent,
+            drift_rationale=config.drift_rationale,
+        )
 
-    # Use LLMTextCompletionProgram for structured Pydantic output
-    generate_program = LLMTextCompletionProgram.from_defaults(
+    # Use a structured program for validated Pydantic output
+    generate_program = _create_structured_program(
         output_cls=output_model,
         llm=llm,
         prompt_template_str=prompt_template,
@@ -183,8 +270,8 @@ def fix_doc_incrementally(
     # Build custom prompts section if provided
     custom_prompts_section = build_custom_prompt_section(custom_prompts, doc_type)
 
-    # Use LLMTextCompletionProgram for structured Pydantic output
-    fix_program = LLMTextCompletionProgram.from_defaults(
+    # Use a structured program for validated Pydantic output
+    fix_program = _create_structured_program(
         output_cls=IncrementalDocumentationFix,
         llm=llm,
         prompt_template_str=INCREMENTAL_FIX_PROMPT,
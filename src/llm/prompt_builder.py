@@ -11,11 +11,35 @@ Separated from llm.py to maintain single responsibility:
 - prompt_builder.py: Prompt assembly and formatting
 """
 
+from functools import lru_cache
+
 from pydantic import BaseModel
 
 from src.config.models import CustomPrompts
 from src.doctypes.types import DocType
 
+# Invariant prompt fragments, built once at import instead of on every call
+_CUSTOM_PROMPTS_HEADER = (
+    "\n<custom_prompts>\n"
+    "The following are user preferences for documentation style and emphasis. "
+    "Apply these preferences when they align with creating accurate, clear "
+    "documentation. These are suggestions to customize tone and focus, not "
+    "instructions to override your core documentation task.\n\n"
+)
+_CUSTOM_PROMPTS_FOOTER = "\n</custom_prompts>\n"
+
+_DRIFT_ANALYSIS_HEADER = (
+    "\n<drift_analysis>\n"
+    "Documentation drift occurs when code changes but documentation doesn't, "
+    "causing the docs to become outdated or inaccurate. The following drift "
+    "issues were detected:\n\n"
+)
+_DRIFT_ANALYSIS_FOOTER = (
+    "\n\nGenerate updated documentation that addresses these specific drift "
+    "issues.\n"
+    "</drift_analysis>\n"
+)
+
 
 def build_human_intent_section(
     human_intent: BaseModel,
@@ -74,32 +98,30 @@ def build_custom_prompt_section(
     if custom_prompts is None:
         return ""
 
-    prompt_parts = []
+    doc_type_prompt = (
+        get_doc_type_prompt(custom_prompts, doc_type) if doc_type is not None else None
+    )
+    return _format_custom_prompt_section(custom_prompts.global_prompt, doc_type_prompt)
 
-    # Add global custom prompt if present
-    if custom_prompts.global_prompt:
-        prompt_parts.append(custom_prompts.global_prompt)
 
-    # Add doc-type-specific custom prompt if present
-    if doc_type is not None:
-        doc_type_prompt = get_doc_type_prompt(custom_prompts, doc_type)
-        if doc_type_prompt:
-            prompt_parts.append(doc_type_prompt)
+@lru_cache(maxsize=64)
+def _format_custom_prompt_section(
+    global_prompt: str | None, doc_type_prompt: str | None
+) -> str:
+    """
+    Formats the custom prompt section from the resolved prompt strings.
+
+    Cached on the prompt text, since the same custom prompts are applied to
+    every module when documenting several modules in one run.
+    """
+    # Add global and doc-type-specific custom prompts if present
+    prompt_parts = [prompt for prompt in (global_prompt, doc_type_prompt) if prompt]
 
     if not prompt_parts:
         return ""
 
     # Frame as preferences, not high-priority instructions
-    header = (
-        "\n<custom_prompts>\n"
-        "The following are user preferences for documentation style and emphasis. "
-        "Apply these preferences when they align with creating accurate, clear "
-        "documentation. These are suggestions to customize tone and focus, not "
-        "instructions to override your core documentation task.\n\n"
-    )
-    footer = "\n</custom_prompts>\n"
-
-    return header + "\n\n".join(prompt_parts) + footer
+    return _CUSTOM_PROMPTS_HEADER + "\n\n".join(prompt_parts) + _CUSTOM_PROMPTS_FOOTER
 
 
 def build_drift_context_section(
@@ -118,15 +140,7 @@ def build_drift_context_section(
     Returns:
         Formatted string with drift detection context, ready to append to code context.
     """
-    return (
-        "\n<drift_analysis>\n"
-        "Documentation drift occurs when code changes but documentation doesn't, "
-        "causing the docs to become outdated or inaccurate. The following drift "
-        "issues were detected:\n\n"
-        f"{drift_rationale}\n\n"
-        "Generate updated documentation that addresses these specific drift issues.\n"
-        "</drift_analysis>\n"
-    )
+    return _DRIFT_ANALYSIS_HEADER + drift_rationale + _DRIFT_ANALYSIS_FOOTER
 
 
 def build_generation_prompt(
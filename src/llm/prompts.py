@@ -141,7 +141,7 @@ RATIONALE REQUIREMENTS:
 - If drift_detected=true: Cite specific checklist item(s) with concrete evidence
 - If drift_detected=false: Briefly confirm documentation accurately reflects code
 
-Respond ONLY with the JSON object schema provided."""
+Respond ONLY with the requested structured output, with no extra commentary."""
 )
 
 
@@ -231,7 +231,7 @@ Analyze the code context and generate comprehensive documentation covering:
 {human_intent_section}
 </user_input>
 
-Respond ONLY with the JSON object schema provided."""
+Respond ONLY with the requested structured output, with no extra commentary."""
 )
 
 
@@ -304,7 +304,7 @@ Do NOT include:
 {human_intent_section}
 </user_input>
 
-Respond ONLY with the JSON object schema provided."""
+Respond ONLY with the requested structured output, with no extra commentary."""
 )
 
 
@@ -378,7 +378,7 @@ Do NOT include:
 {human_intent_section}
 </user_input>
 
-Respond ONLY with the JSON object schema provided."""
+Respond ONLY with the requested structured output, with no extra commentary."""
 )
 
 
@@ -451,5 +451,5 @@ COMMON MISTAKE TO AVOID:
 ❌ WRONG: Returning only new/changed bullet points for "update"
 ✓ CORRECT: Returning FULL section with changes integrated
 
-Respond with the structured JSON output schema provided."""
+Respond with the requested structured output."""
 )
@@ -2,8 +2,14 @@
 
 from src.security.input_validation import (
     ValidationResult,
+    validate_batch,
     validate_code_context,
     validate_custom_prompt,
 )
 
-__all__ = ["ValidationResult", "validate_code_context", "validate_custom_prompt"]
+__all__ = [
+    "ValidationResult",
+    "validate_batch",
+    "validate_code_context",
+    "validate_custom_prompt",
+]
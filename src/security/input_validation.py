@@ -1,19 +1,25 @@
 """Input validation for prompt injection detection."""
 
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Literal
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ValidationResult:
     """Result of input validation."""
 
     is_suspicious: bool
-    warnings: list[str]
+    warnings: tuple[str, ...]
     severity: Literal["low", "medium", "high"]
 
 
+# Shared result for inputs with no suspicious patterns
+_NEGATIVE_RESULT = ValidationResult(is_suspicious=False, warnings=(), severity="low")
+
+
 # Patterns that suggest prompt injection attempts
 SUSPICIOUS_PATTERNS = [
     # Direct instruction attempts
@@ -52,6 +58,105 @@ SUSPICIOUS_PATTERNS = [
     (r"\byou\s+are\s+(now|actually|really)\b", "Attempts to redefine LLM role", "high"),
 ]
 
+# A leading "\b" followed by a word or a group of alternative words, or a
+# leading escaped character, with no quantifier that would make it optional
+_LEADING_LITERAL = re.compile(
+    r"\\b(?:\((?P<words>\w+(?:\|\w+)*)\)|(?P<word>\w+))(?![?*{])"
+    r"|\\(?P<char>\W)(?![?*{])"
+)
+
+
+def _leading_literals(pattern: str) -> tuple[str, ...]:
+    """
+    Returns the literals every match of a suspicious pattern starts with.
+
+    The prompt prefilter only scans text containing one of these, so a pattern
+    without a recognizable leading literal must fail loudly rather than never
+    fire.
+
+    Raises:
+        ValueError: If the pattern does not start with a literal, or has a
+            top-level alternative that could start with something else.
+    """
+    # Drop escapes, character classes and groups to expose top-level "|"
+    outline = re.sub(r"\\.|\[(?:\\.|[^\]])*\]", "", pattern)
+    while (stripped := re.sub(r"\([^()]*\)", "", outline)) != outline:
+        outline = stripped
+
+    match = _LEADING_LITERAL.match(pattern)
+    if match is None or "|" in outline:
+        raise ValueError(f"No leading literal in suspicious pattern: {pattern}")
+    if match["words"]:
+        return tuple(match["words"].split("|"))
+    return (match["word"] or match["char"],)
+
+
+# Leading literals of the patterns above, used as a cheap prefilter: an ASCII
+# prompt with none of them cannot match any pattern
+_PATTERN_LITERALS = tuple(
+    dict.fromkeys(
+        literal
+        for pattern, _, _ in SUSPICIOUS_PATTERNS
+        for literal in _leading_literals(pattern)
+    )
+)
+_PATTERN_ANCHORS = "|".join(
+    rf"\b{literal}" if literal[0].isalnum() else re.escape(literal)
+    for literal in _PATTERN_LITERALS
+)
+
+# Columns of SUSPICIOUS_PATTERNS, indexed by pattern position
+_PATTERN_WARNINGS = tuple(
+    f"{warning} (pattern: {pattern})" for pattern, warning, _ in SUSPICIOUS_PATTERNS
+)
+# Severities are ranked as indexes into _SEVERITY_NAMES so they compare as ints
+_SEVERITY_NAMES: tuple[Literal["low", "medium", "high"], ...] = (
+    "low",
+    "medium",
+    "high",
+)
+_PATTERN_SEVERITIES = tuple(
+    _SEVERITY_NAMES.index(severity) for _, _, severity in SUSPICIOUS_PATTERNS
+)
+
+# All patterns in one scan. Each pattern sits in its own optional lookahead
+# group, so a match consumes no text, overlapping hits are still reported and
+# every pattern starting at a position is tried. The anchor guard skips
+# positions no pattern can start at.
+_COMBINED_SOURCE = f"(?={_PATTERN_ANCHORS})" + "".join(
+    f"(?:(?=(?P<p{index}>{pattern})))?"
+    for index, (pattern, _, _) in enumerate(SUSPICIOUS_PATTERNS)
+)
+# For text that is already lowercase; the pattern sources are all lowercase
+_LOWERCASE_COMBINED_PATTERN = re.compile(_COMBINED_SOURCE)
+# Group number of each pattern in the combined scan, by pattern position
+_PATTERN_GROUPS = tuple(
+    _LOWERCASE_COMBINED_PATTERN.groupindex[f"p{index}"]
+    for index in range(len(SUSPICIOUS_PATTERNS))
+)
+
+# Compiled once at import, for prompts that cannot be lowercased safely
+_COMPILED_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE) for pattern, _, _ in SUSPICIOUS_PATTERNS
+)
+
+# Comment patterns with a literal every match contains, used to prefilter
+# ASCII code, and the warning each one raises
+_COMMENT_PATTERNS = (
+    (
+        re.compile(r"#.*\b(important|critical|system).*instruction", re.IGNORECASE),
+        "instruction",
+        "Code comments contain instruction-like language. "
+        "Review for potential prompt injection in docstrings.",
+    ),
+    (
+        re.compile(r"#.*IMPORTANT:.*\b(ignore|override|instead)\b", re.IGNORECASE),
+        "important:",
+        "Code comments contain suspicious override patterns.",
+    ),
+)
+_COMMENT_PATTERN_LITERALS = tuple(literal for _, literal, _ in _COMMENT_PATTERNS)
+
 
 def validate_custom_prompt(prompt: str) -> ValidationResult:
     """
@@ -63,27 +168,98 @@ def validate_custom_prompt(prompt: str) -> ValidationResult:
     Returns:
         ValidationResult with detected issues.
     """
-    if not prompt:
-        return ValidationResult(is_suspicious=False, warnings=[], severity="low")
+    if not prompt or prompt.isspace():
+        return _NEGATIVE_RESULT
 
-    warnings = []
-    max_severity = "low"
+    return _scan_custom_prompt(prompt)
+
+
+def validate_batch(prompts: Iterable[str]) -> list[ValidationResult]:
+    """
+    Validate several custom prompts for suspicious patterns.
 
-    for pattern, warning, severity in SUSPICIOUS_PATTERNS:
-        if re.search(pattern, prompt, re.IGNORECASE):
-            warnings.append(f"{warning} (pattern: {pattern})")
-            if severity == "high":
-                max_severity = "high"
-            elif severity == "medium" and max_severity == "low":
-                max_severity = "medium"
+    Equivalent to calling validate_custom_prompt on each prompt, sharing its
+    compiled patterns and result cache, so repeated prompts are scanned once.
+
+    Args:
+        prompts: The custom prompt texts to validate.
+
+    Returns:
+        A ValidationResult for each prompt, in input order.
+    """
+    return [validate_custom_prompt(prompt) for prompt in prompts]
+
+
+def _matched_pattern_indexes(prompt: str) -> set[int]:
+    """
+    Returns the indexes of the SUSPICIOUS_PATTERNS the prompt matches.
+
+    ASCII prompts are lowercased once, prefiltered with substring search and
+    scanned with the case-sensitive combined pattern, which is much faster
+    than matching with re.IGNORECASE. Other prompts are searched with each
+    case-insensitive pattern, because re.IGNORECASE also folds some non-ASCII
+    letters (dotless i, long s) onto ASCII ones, which lowercasing does not;
+    an IGNORECASE anchor prefilter costs more there than the searches it saves.
+    """
+    if not prompt.isascii():
+        return {
+            index
+            for index, pattern in enumerate(_COMPILED_PATTERNS)
+            if pattern.search(prompt)
+        }
+
+    lowered = prompt.lower()
+    if not any(literal in lowered for literal in _PATTERN_LITERALS):
+        return set()
+
+    return {
+        index
+        for match in _LOWERCASE_COMBINED_PATTERN.finditer(lowered)
+        for index, group in enumerate(_PATTERN_GROUPS)
+        if match.start(group) != -1
+    }
+
+
+@lru_cache(maxsize=256)
+def _scan_custom_prompt(prompt: str) -> ValidationResult:
+    """
+    Scans a custom prompt for suspicious patterns.
+
+    Cached on the prompt text, since the same custom prompts are validated
+    every time the configuration is loaded.
+    """
+    matched = _matched_pattern_indexes(prompt)
+    if not matched:
+        return _NEGATIVE_RESULT
+
+    # Report in table order, once per pattern, however often it matched
+    indexes = sorted(matched)
 
     return ValidationResult(
-        is_suspicious=len(warnings) > 0,
-        warnings=warnings,
-        severity=max_severity,
+        is_suspicious=True,
+        warnings=tuple(_PATTERN_WARNINGS[index] for index in indexes),
+        severity=_SEVERITY_NAMES[max(_PATTERN_SEVERITIES[index] for index in indexes)],
     )
 
 
+def _search_windows(
+    pattern: re.Pattern[str], text: str, windows: tuple[tuple[int, int], ...]
+) -> bool:
+    """Checks whether the pattern matches within any (start, end) window of text."""
+    return any(pattern.search(text, start, end) for start, end in windows)
+
+
+def _windows_contain_literal(
+    text: str, windows: tuple[tuple[int, int], ...], literals: tuple[str, ...]
+) -> bool:
+    """Checks whether any lowercased (start, end) window of text has a literal."""
+    for start, end in windows:
+        lowered = text[start:end].lower()
+        if any(literal in lowered for literal in literals):
+            return True
+    return False
+
+
 def validate_code_context(
     context: str, max_sample_size: int = 10000
 ) -> ValidationResult:
@@ -100,26 +276,34 @@ def validate_code_context(
     Returns:
         ValidationResult with detected issues (lower severity than prompts).
     """
-    # Sample first and last portions of context
-    sample = context[: max_sample_size // 2] + context[-max_sample_size // 2 :]
+    if not context or context.isspace():
+        return _NEGATIVE_RESULT
+
+    # Sample first and last portions of context, scanned in place
+    if len(context) <= max_sample_size:
+        windows = ((0, len(context)),)
+    else:
+        half = max_sample_size // 2
+        windows = ((0, half), (len(context) - half, len(context)))
 
-    warnings = []
+    # Substring checks are much cheaper than the comment patterns, and for ASCII
+    # text lowercasing matches what re.IGNORECASE does
+    if context.isascii() and not _windows_contain_literal(
+        context, windows, _COMMENT_PATTERN_LITERALS
+    ):
+        return _NEGATIVE_RESULT
 
-    # Look for comment blocks that look like instructions
-    instruction_pattern = r"#.*\b(important|critical|system).*instruction"
-    if re.search(instruction_pattern, sample, re.IGNORECASE):
-        warnings.append(
-            "Code comments contain instruction-like language. "
-            "Review for potential prompt injection in docstrings."
-        )
+    warnings = [
+        warning
+        for pattern, _, warning in _COMMENT_PATTERNS
+        if _search_windows(pattern, context, windows)
+    ]
 
-    # Check for suspicious "IMPORTANT:" patterns in comments
-    important_override = r"#.*IMPORTANT:.*\b(ignore|override|instead)\b"
-    if re.search(important_override, sample, re.IGNORECASE):
-        warnings.append("Code comments contain suspicious override patterns.")
+    if not warnings:
+        return _NEGATIVE_RESULT
 
     return ValidationResult(
-        is_suspicious=len(warnings) > 0,
-        warnings=warnings,
+        is_suspicious=True,
+        warnings=tuple(warnings),
         severity="low",  # Code comments are always lower risk than custom prompts
     )
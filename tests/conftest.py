@@ -5,9 +5,10 @@ from typing import Any, Protocol, cast
 
 import pytest
 from llama_index.core.llms import LLM
-from pytest_mock import MockerFixture
+from pytest_mock import MockerFixture, MockType
 
 from src.cache import clear_drift_cache
+from src.llm import clear_llm_cache
 from src.records import DocumentationDriftCheck, ModuleDocumentation
 
 
@@ -40,6 +41,24 @@ def clear_drift_cache_before_each_test() -> None:
     clear_drift_cache()
 
 
+@pytest.fixture(autouse=True)
+def clear_llm_cache_before_each_test() -> None:
+    """Clear cached LLM clients so each test sees its own provider mocks."""
+    clear_llm_cache()
+
+
+@pytest.fixture
+def clean_env(monkeypatch: pytest.MonkeyPatch) -> pytest.MonkeyPatch:
+    """Remove LLM provider API keys from the environment for the current test.
+
+    Uses monkeypatch's per-variable undo stack instead of copying and restoring
+    the whole environment. Set keys on the returned monkeypatch as needed.
+    """
+    for env_var in ("ANTHROPIC_API_KEY", "OPENAI_API_KEY", "GOOGLE_API_KEY"):
+        monkeypatch.delenv(env_var, raising=False)
+    return monkeypatch
+
+
 @pytest.fixture
 def sample_drift_check_no_drift() -> DocumentationDriftCheck:
     """Sample DocumentationDriftCheck with no drift."""
@@ -117,6 +136,20 @@ def mock_llm_client(mocker: MockerFixture) -> LLM:
     return cast(LLM, mock_client)
 
 
+@pytest.fixture
+def mock_llm_program(mocker: MockerFixture) -> tuple[MockType, MockType]:
+    """Mock LLMTextCompletionProgram so LLM operations never call a real model.
+
+    Returns a (program, program_class) pair where program_class.from_defaults
+    returns program. Configure program.return_value or program.side_effect to
+    control what the LLM "responds" with.
+    """
+    program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
+    program = mocker.MagicMock()
+    program_class.from_defaults.return_value = program
+    return program, program_class
+
+
 @pytest.fixture
 def mock_console(mocker: MockerFixture) -> MockConsoleProtocol:
     """Mock Rich console to suppress output during tests."""
@@ -169,13 +202,3 @@ def git_repo(tmp_path: Path) -> Path:
     repo.mkdir()
     (repo / ".git").mkdir()
     return repo
-
-
-@pytest.fixture
-def git_repo_with_module(git_repo: Path) -> tuple[Path, Path]:
-    """Create a git repo with a Python module."""
-    module = git_repo / "src"
-    module.mkdir()
-    (module / "__init__.py").write_text("")
-    (module / "main.py").write_text("def main():\n    pass\n")
-    return git_repo, module
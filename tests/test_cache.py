@@ -1,11 +1,12 @@
 """Tests for src/cache.py"""
 
+import hashlib
 import json
 from pathlib import Path
 
 import pytest
 from llama_index.core.llms import LLM
-from pytest_mock import MockerFixture
+from pytest_mock import MockerFixture, MockType
 
 from src.cache import (
     DRIFT_CACHE_SIZE,
@@ -39,6 +40,14 @@ def test_hash_content() -> None:
     assert all(c in "0123456789abcdef" for c in hash1)
 
 
+def test_hash_content_empty_matches_sha256_of_empty_string() -> None:
+    """Test None and empty content hash like an empty string always did."""
+    expected = hashlib.sha256(b"").hexdigest()
+
+    assert _hash_content(None) == expected
+    assert _hash_content("") == expected
+
+
 def test_generate_cache_key_includes_llm_model(
     mock_llm_client: LLM,
 ) -> None:
@@ -60,17 +69,15 @@ def test_generate_cache_key_includes_llm_model(
 
 
 def test_clear_drift_cache_removes_all_entries(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
 ) -> None:
     """Test clear_drift_cache removes all cached entries."""
     clear_drift_cache()
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, mock_program_class = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Add some entries to cache
     check_drift(llm=mock_llm_client, context="ctx1", current_doc="doc1")
@@ -94,17 +101,15 @@ def test_clear_drift_cache_removes_all_entries(
 
 
 def test_get_drift_cache_info_returns_correct_stats(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
 ) -> None:
     """Test get_drift_cache_info returns accurate cache statistics."""
     clear_drift_cache()
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Initially empty
     cache_info = get_drift_cache_info()
@@ -164,17 +169,15 @@ def test_load_handles_errors(
 
 def test_save_and_load_roundtrip(
     tmp_path: Path,
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
 ) -> None:
     """Test save and load cache roundtrip preserves data."""
     clear_drift_cache()
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, mock_program_class = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Add entries to cache
     check_drift(llm=mock_llm_client, context="ctx1", current_doc="doc1")
@@ -202,17 +205,15 @@ def test_save_and_load_roundtrip(
 
 
 def test_set_cache_max_size(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
 ) -> None:
     """Test set_cache_max_size updates the maximum cache size."""
     clear_drift_cache()
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Set small cache size
     set_cache_max_size(2)
@@ -236,17 +237,15 @@ def test_set_cache_max_size(
 
 def test_save_drift_cache_creates_parent_directory(
     tmp_path: Path,
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
 ) -> None:
     """Test save_drift_cache_to_disk creates parent directories."""
     clear_drift_cache()
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Add entry to cache
     check_drift(llm=mock_llm_client, context="test", current_doc="doc")
@@ -265,16 +264,15 @@ def test_save_drift_cache_creates_parent_directory(
 def test_save_drift_cache_handles_permission_error(
     tmp_path: Path,
     mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
 ) -> None:
     """Test save_drift_cache_to_disk handles OSError gracefully."""
     clear_drift_cache()
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Add entry to cache
     check_drift(llm=mock_llm_client, context="test", current_doc="doc")
@@ -293,17 +291,15 @@ def test_save_drift_cache_handles_permission_error(
 
 def test_save_drift_cache_atomic_write(
     tmp_path: Path,
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
 ) -> None:
     """Test save_drift_cache_to_disk uses atomic write."""
     clear_drift_cache()
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Add entry to cache
     check_drift(llm=mock_llm_client, context="test", current_doc="doc")
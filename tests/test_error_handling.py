@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 from llama_index.core.llms import LLM
-from pytest_mock import MockerFixture
+from pytest_mock import MockerFixture, MockType
 
 from src.cache import load_drift_cache_from_disk, save_drift_cache_to_disk
 from src.config import DokkenConfig
@@ -297,16 +297,17 @@ def test_cache_corruption_with_partial_valid_data(tmp_path: Path) -> None:
 
 
 def test_cache_save_failure_recovery(
-    tmp_path: Path, mocker: MockerFixture, mock_llm_client: LLM
+    tmp_path: Path,
+    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
+    mock_llm_client: LLM,
 ) -> None:
     """Test that cache save failures don't crash the application."""
     # Add entry to cache
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = DocumentationDriftCheck(
         drift_detected=False, rationale="Test"
     )
-    mock_program_class.from_defaults.return_value = mock_program
 
     check_drift(llm=mock_llm_client, context="test", current_doc="doc")
 
@@ -344,12 +345,12 @@ def test_cache_binary_file_recovery(tmp_path: Path) -> None:
 # --- Tests for Network Timeout Scenarios ---
 
 
-def test_llm_connection_timeout(mocker: MockerFixture, mock_llm_client: LLM) -> None:
+def test_llm_connection_timeout(
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
+) -> None:
     """Test LLM operations handle connection timeout errors."""
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.side_effect = ConnectionError("Connection timed out")
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: LLM connection times out
     # Then: Should propagate connection error
@@ -361,12 +362,12 @@ def test_llm_connection_timeout(mocker: MockerFixture, mock_llm_client: LLM) ->
         )
 
 
-def test_llm_read_timeout(mocker: MockerFixture, mock_llm_client: LLM) -> None:
+def test_llm_read_timeout(
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
+) -> None:
     """Test LLM operations handle read timeout errors."""
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.side_effect = TimeoutError("Read timeout")
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: LLM read times out
     # Then: Should propagate timeout error
@@ -424,13 +425,11 @@ def test_multi_module_check_with_intermittent_timeouts(
 
 
 def test_generate_doc_with_slow_response_timeout(
-    mocker: MockerFixture, mock_llm_client: LLM
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
 ) -> None:
     """Test generate_doc handles slow LLM response timeouts."""
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.side_effect = TimeoutError("Request exceeded 120s timeout")
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: LLM takes too long to respond
     # Then: Should propagate timeout
@@ -3,21 +3,36 @@
 from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
 
+from src import file_utils
 from src.doctypes import DocType
-from src.file_utils import ensure_output_directory, find_repo_root, resolve_output_path
+from src.file_utils import (
+    clear_repo_root_cache,
+    ensure_output_directory,
+    find_repo_root,
+    resolve_output_path,
+)
 
 
-def test_find_repo_root_with_git(git_repo: Path) -> None:
-    """Test find_repo_root finds .git directory."""
-    # Create nested directory
-    nested = git_repo / "src" / "module"
-    nested.mkdir(parents=True)
+@pytest.fixture(scope="module")
+def repo_tree(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Git repository with a nested src/module directory, built once per module.
+
+    Only for tests that read the tree; tests that write should use git_repo.
+    """
+    root = tmp_path_factory.mktemp("repo")
+    (root / ".git").mkdir()
+    (root / "src" / "module").mkdir(parents=True)
+    return root
+
 
+def test_find_repo_root_with_git(repo_tree: Path) -> None:
+    """Test find_repo_root finds .git directory."""
     # Should find repo root from nested directory
-    result = find_repo_root(str(nested))
+    result = find_repo_root(str(repo_tree / "src" / "module"))
 
-    assert result == str(git_repo)
+    assert result == str(repo_tree)
 
 
 def test_find_repo_root_no_git(tmp_path: Path) -> None:
@@ -31,11 +46,48 @@ def test_find_repo_root_no_git(tmp_path: Path) -> None:
     assert result is None
 
 
-def test_find_repo_root_from_root_directory(git_repo: Path) -> None:
+def test_find_repo_root_from_root_directory(repo_tree: Path) -> None:
     """Test find_repo_root when starting from repo root."""
-    result = find_repo_root(str(git_repo))
+    result = find_repo_root(str(repo_tree))
+
+    assert result == str(repo_tree)
+
 
-    assert result == str(git_repo)
+def test_find_repo_root_caches_lookup(repo_tree: Path, mocker: MockerFixture) -> None:
+    """Test find_repo_root reuses a found root until the cache is cleared."""
+    start = str(repo_tree / "src")
+    clear_repo_root_cache()
+    spy = mocker.spy(file_utils, "_find_repo_root_from")
+
+    assert find_repo_root(start) == str(repo_tree)
+    assert find_repo_root(start) == str(repo_tree)
+    assert spy.call_count == 1
+
+    clear_repo_root_cache()
+    assert find_repo_root(start) == str(repo_tree)
+    assert spy.call_count == 2
+
+
+def test_find_repo_root_does_not_cache_missing_repo(tmp_path: Path) -> None:
+    """Test a repository created after a failed lookup is still found."""
+    assert find_repo_root(str(tmp_path)) is None
+
+    (tmp_path / ".git").mkdir()
+    assert find_repo_root(str(tmp_path)) == str(tmp_path)
+
+
+def test_find_repo_root_resolves_relative_path_per_directory(
+    git_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test relative start paths are cached by the directory they resolve to."""
+    outside = tmp_path / "outside"
+    outside.mkdir()
+
+    monkeypatch.chdir(git_repo)
+    assert find_repo_root(".") == str(git_repo)
+
+    monkeypatch.chdir(outside)
+    assert find_repo_root(".") is None
 
 
 def test_resolve_output_path_module_readme(tmp_path: Path) -> None:
@@ -50,30 +102,26 @@ def test_resolve_output_path_module_readme(tmp_path: Path) -> None:
     assert result == str(module_dir / "README.md")
 
 
-def test_resolve_output_path_project_readme(
-    git_repo_with_module: tuple[Path, Path],
-) -> None:
+def test_resolve_output_path_project_readme(repo_tree: Path) -> None:
     """Test resolve_output_path for PROJECT_README."""
-    repo_root, module_dir = git_repo_with_module
+    module_dir = repo_tree / "src" / "module"
 
     result = resolve_output_path(
         doc_type=DocType.PROJECT_README, module_path=str(module_dir)
     )
 
-    assert result == str(repo_root / "README.md")
+    assert result == str(repo_tree / "README.md")
 
 
-def test_resolve_output_path_style_guide(
-    git_repo_with_module: tuple[Path, Path],
-) -> None:
+def test_resolve_output_path_style_guide(repo_tree: Path) -> None:
     """Test resolve_output_path for STYLE_GUIDE."""
-    repo_root, module_dir = git_repo_with_module
+    module_dir = repo_tree / "src" / "module"
 
     result = resolve_output_path(
         doc_type=DocType.STYLE_GUIDE, module_path=str(module_dir)
     )
 
-    assert result == str(repo_root / "docs" / "style-guide.md")
+    assert result == str(repo_tree / "docs" / "style-guide.md")
 
 
 def test_resolve_output_path_project_readme_no_git(tmp_path: Path) -> None:
@@ -96,11 +144,9 @@ def test_resolve_output_path_style_guide_no_git(tmp_path: Path) -> None:
         resolve_output_path(doc_type=DocType.STYLE_GUIDE, module_path=str(module_dir))
 
 
-def test_resolve_output_path_style_guide_invalid_type(
-    git_repo_with_module: tuple[Path, Path],
-) -> None:
+def test_resolve_output_path_style_guide_invalid_type(repo_tree: Path) -> None:
     """Test resolve_output_path raises ValueError for invalid doc type."""
-    _, module_dir = git_repo_with_module
+    module_dir = repo_tree / "src" / "module"
 
     with pytest.raises(ValueError, match="Unknown doc type"):
         resolve_output_path(doc_type="NOT-VALID", module_path=str(module_dir))  # type: ignore
@@ -148,3 +194,12 @@ def test_ensure_output_directory_permission_error(tmp_path: Path, mocker) -> Non
 
     with pytest.raises(PermissionError, match="Cannot create"):
         ensure_output_directory(str(output_path))
+
+
+def test_ensure_output_directory_parent_is_file(tmp_path: Path) -> None:
+    """Test ensure_output_directory raises when the parent path is a file."""
+    blocker = tmp_path / "docs"
+    blocker.write_text("not a directory")
+
+    with pytest.raises(PermissionError, match="Cannot create"):
+        ensure_output_directory(str(blocker / "file.md"))
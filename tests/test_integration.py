@@ -8,7 +8,7 @@ from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
-from pytest_mock import MockerFixture
+from pytest_mock import MockerFixture, MockType
 
 from src.main import cli
 from src.records import (
@@ -155,6 +155,7 @@ def auth_service_drift_check() -> DocumentationDriftCheck:
 def test_integration_generate_documentation(
     tmp_path: Path,
     mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     payment_service_drift_check: DocumentationDriftCheck,
     payment_service_generated_doc: ModuleDocumentation,
 ) -> None:
@@ -176,13 +177,11 @@ def test_integration_generate_documentation(
     mocker.patch("src.workflows.initialize_llm", return_value=mock_llm_client)
     mocker.patch("src.llm.llm.initialize_llm", return_value=mock_llm_client)
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.side_effect = [
         payment_service_drift_check,
         payment_service_generated_doc,
     ]
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Mock console and human intent
     mocker.patch("src.main.console")
@@ -214,6 +213,7 @@ def test_integration_generate_documentation(
 def test_integration_check_documentation_drift(
     tmp_path: Path,
     mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     auth_service_drift_check: DocumentationDriftCheck,
 ) -> None:
     """
@@ -238,10 +238,8 @@ def test_integration_check_documentation_drift(
     mocker.patch("src.workflows.initialize_llm", return_value=mock_llm_client)
     mocker.patch("src.llm.llm.initialize_llm", return_value=mock_llm_client)
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = auth_service_drift_check
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Mock console
     mocker.patch("src.main.console")
@@ -279,7 +277,9 @@ def test_integration_check_documentation_drift(
     assert "create_session()" in current_doc
 
 
-def test_integration_check_fix_workflow(tmp_path: Path, mocker: MockerFixture) -> None:
+def test_integration_check_fix_workflow(
+    tmp_path: Path, mocker: MockerFixture, mock_llm_program: tuple[MockType, MockType]
+) -> None:
     """
     Integration test for check → fix workflow.
 
@@ -335,10 +335,8 @@ def new_function():
         preserved_sections=["Auth Module"],
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.side_effect = [drift_check, fix]
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Mock console
     mocker.patch("src.main.console")
@@ -356,7 +354,9 @@ def new_function():
     assert "new_function" in updated_readme
 
 
-def test_integration_cache_persistence(tmp_path: Path, mocker: MockerFixture) -> None:
+def test_integration_cache_persistence(
+    tmp_path: Path, mocker: MockerFixture, mock_llm_program: tuple[MockType, MockType]
+) -> None:
     """
     Integration test for cache persistence across runs.
 
@@ -374,10 +374,8 @@ def test_integration_cache_persistence(tmp_path: Path, mocker: MockerFixture) ->
 
     drift_check = DocumentationDriftCheck(drift_detected=False, rationale="Up to date")
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = drift_check
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Mock console
     mocker.patch("src.main.console")
@@ -1,11 +1,12 @@
 """Tests for src/llm.py"""
 
-import os
+import dataclasses
 
 import pytest
 from llama_index.core.llms import LLM
+from llama_index.core.llms.function_calling import FunctionCallingLLM
 from pydantic import ValidationError
-from pytest_mock import MockerFixture
+from pytest_mock import MockerFixture, MockType
 
 from src.config.models import CustomPrompts
 from src.constants import LLM_TEMPERATURE
@@ -14,6 +15,7 @@ from src.llm import (
     MODULE_GENERATION_PROMPT,
     GenerationConfig,
     check_drift,
+    clear_llm_cache,
     fix_doc_incrementally,
     generate_doc,
     initialize_llm,
@@ -29,60 +31,58 @@ from src.records import (
 # --- Tests for initialize_llm() ---
 
 
-def test_initialize_llm_with_anthropic_key(mocker: MockerFixture) -> None:
-    """Test initialize_llm creates Anthropic client when ANTHROPIC_API_KEY is set."""
-    mocker.patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test_api_key"}, clear=True)
-    mock_anthropic = mocker.patch("src.llm.llm.Anthropic")
-
-    llm = initialize_llm()
-
-    mock_anthropic.assert_called_once_with(
-        model="claude-3-5-haiku-20241022", temperature=LLM_TEMPERATURE, max_tokens=8192
-    )
-    assert llm == mock_anthropic.return_value
-
-
-def test_initialize_llm_with_openai_key(mocker: MockerFixture) -> None:
-    """Test initialize_llm creates OpenAI client when OPENAI_API_KEY is set."""
-    mocker.patch.dict(os.environ, {"OPENAI_API_KEY": "test_api_key"}, clear=True)
-    mock_openai = mocker.patch("src.llm.llm.OpenAI")
-
-    llm = initialize_llm()
-
-    mock_openai.assert_called_once_with(
-        model="gpt-4o-mini", temperature=LLM_TEMPERATURE
-    )
-    assert llm == mock_openai.return_value
-
-
-def test_initialize_llm_with_google_key(mocker: MockerFixture) -> None:
-    """Test initialize_llm creates GoogleGenAI client when GOOGLE_API_KEY is set."""
-    mocker.patch.dict(os.environ, {"GOOGLE_API_KEY": "test_api_key"}, clear=True)
-    mock_genai = mocker.patch("src.llm.llm.GoogleGenAI")
+@pytest.mark.parametrize(
+    "env_var,llm_class_path,expected_kwargs",
+    [
+        (
+            "ANTHROPIC_API_KEY",
+            "llama_index.llms.anthropic.Anthropic",
+            {
+                "model": "claude-3-5-haiku-20241022",
+                "temperature": LLM_TEMPERATURE,
+                "max_tokens": 8192,
+            },
+        ),
+        (
+            "OPENAI_API_KEY",
+            "llama_index.llms.openai.OpenAI",
+            {"model": "gpt-4o-mini", "temperature": LLM_TEMPERATURE},
+        ),
+        (
+            "GOOGLE_API_KEY",
+            "llama_index.llms.google_genai.GoogleGenAI",
+            {"model": "gemini-2.5-flash", "temperature": LLM_TEMPERATURE},
+        ),
+    ],
+)
+def test_initialize_llm_selects_provider_for_api_key(
+    mocker: MockerFixture,
+    clean_env: pytest.MonkeyPatch,
+    env_var: str,
+    llm_class_path: str,
+    expected_kwargs: dict[str, object],
+) -> None:
+    """Test initialize_llm creates the provider client matching the API key set."""
+    clean_env.setenv(env_var, "test_api_key")
+    mock_llm_class = mocker.patch(llm_class_path)
 
     llm = initialize_llm()
 
-    mock_genai.assert_called_once_with(
-        model="gemini-2.5-flash", temperature=LLM_TEMPERATURE
-    )
-    assert llm == mock_genai.return_value
+    mock_llm_class.assert_called_once_with(**expected_kwargs)
+    assert llm == mock_llm_class.return_value
 
 
-def test_initialize_llm_priority_order(mocker: MockerFixture) -> None:
+def test_initialize_llm_priority_order(
+    mocker: MockerFixture, clean_env: pytest.MonkeyPatch
+) -> None:
     """Test initialize_llm prioritizes Anthropic > OpenAI > Google."""
     # Set all three API keys
-    mocker.patch.dict(
-        os.environ,
-        {
-            "ANTHROPIC_API_KEY": "anthropic_key",
-            "OPENAI_API_KEY": "openai_key",
-            "GOOGLE_API_KEY": "google_key",
-        },
-        clear=True,
-    )
-    mock_anthropic = mocker.patch("src.llm.llm.Anthropic")
-    mock_openai = mocker.patch("src.llm.llm.OpenAI")
-    mock_genai = mocker.patch("src.llm.llm.GoogleGenAI")
+    clean_env.setenv("ANTHROPIC_API_KEY", "anthropic_key")
+    clean_env.setenv("OPENAI_API_KEY", "openai_key")
+    clean_env.setenv("GOOGLE_API_KEY", "google_key")
+    mock_anthropic = mocker.patch("llama_index.llms.anthropic.Anthropic")
+    mock_openai = mocker.patch("llama_index.llms.openai.OpenAI")
+    mock_genai = mocker.patch("llama_index.llms.google_genai.GoogleGenAI")
 
     llm = initialize_llm()
 
@@ -93,15 +93,14 @@ def test_initialize_llm_priority_order(mocker: MockerFixture) -> None:
     assert llm == mock_anthropic.return_value
 
 
-def test_initialize_llm_openai_priority_over_google(mocker: MockerFixture) -> None:
+def test_initialize_llm_openai_priority_over_google(
+    mocker: MockerFixture, clean_env: pytest.MonkeyPatch
+) -> None:
     """Test initialize_llm prioritizes OpenAI over Google when both keys are set."""
-    mocker.patch.dict(
-        os.environ,
-        {"OPENAI_API_KEY": "openai_key", "GOOGLE_API_KEY": "google_key"},
-        clear=True,
-    )
-    mock_openai = mocker.patch("src.llm.llm.OpenAI")
-    mock_genai = mocker.patch("src.llm.llm.GoogleGenAI")
+    clean_env.setenv("OPENAI_API_KEY", "openai_key")
+    clean_env.setenv("GOOGLE_API_KEY", "google_key")
+    mock_openai = mocker.patch("llama_index.llms.openai.OpenAI")
+    mock_genai = mocker.patch("llama_index.llms.google_genai.GoogleGenAI")
 
     llm = initialize_llm()
 
@@ -111,10 +110,8 @@ def test_initialize_llm_openai_priority_over_google(mocker: MockerFixture) -> No
     assert llm == mock_openai.return_value
 
 
-def test_initialize_llm_missing_all_api_keys(mocker: MockerFixture) -> None:
+def test_initialize_llm_missing_all_api_keys(clean_env: pytest.MonkeyPatch) -> None:
     """Test initialize_llm raises ValueError when no API keys are set."""
-    mocker.patch.dict(os.environ, {}, clear=True)
-
     with pytest.raises(
         ValueError,
         match=r"No API key found\.",
@@ -122,6 +119,53 @@ def test_initialize_llm_missing_all_api_keys(mocker: MockerFixture) -> None:
         initialize_llm()
 
 
+def test_initialize_llm_reuses_client(
+    mocker: MockerFixture, clean_env: pytest.MonkeyPatch
+) -> None:
+    """Test initialize_llm creates one client per provider and reuses it."""
+    clean_env.setenv("OPENAI_API_KEY", "test_api_key")
+    mock_openai = mocker.patch("llama_index.llms.openai.OpenAI")
+
+    first = initialize_llm()
+    second = initialize_llm()
+
+    mock_openai.assert_called_once()
+    assert first is second
+
+
+def test_initialize_llm_creates_new_client_when_api_key_changes(
+    mocker: MockerFixture, clean_env: pytest.MonkeyPatch
+) -> None:
+    """Test initialize_llm does not reuse a client created with an old API key."""
+    mock_openai = mocker.patch(
+        "llama_index.llms.openai.OpenAI", side_effect=lambda **_: mocker.Mock()
+    )
+
+    clean_env.setenv("OPENAI_API_KEY", "old_api_key")
+    first = initialize_llm()
+    clean_env.setenv("OPENAI_API_KEY", "new_api_key")
+    second = initialize_llm()
+    third = initialize_llm()
+
+    assert mock_openai.call_count == 2
+    assert first is not second
+    assert second is third
+
+
+def test_clear_llm_cache_forces_new_client(
+    mocker: MockerFixture, clean_env: pytest.MonkeyPatch
+) -> None:
+    """Test clear_llm_cache makes initialize_llm create a fresh client."""
+    clean_env.setenv("OPENAI_API_KEY", "test_api_key")
+    mock_openai = mocker.patch("llama_index.llms.openai.OpenAI")
+
+    initialize_llm()
+    clear_llm_cache()
+    initialize_llm()
+
+    assert mock_openai.call_count == 2
+
+
 @pytest.mark.parametrize(
     "env_var,api_key",
     [
@@ -131,17 +175,17 @@ def test_initialize_llm_missing_all_api_keys(mocker: MockerFixture) -> None:
     ],
 )
 def test_initialize_llm_with_various_key_formats(
-    mocker: MockerFixture, env_var: str, api_key: str
+    mocker: MockerFixture, clean_env: pytest.MonkeyPatch, env_var: str, api_key: str
 ) -> None:
     """Test initialize_llm works with various API key formats."""
-    mocker.patch.dict(os.environ, {env_var: api_key}, clear=True)
+    clean_env.setenv(env_var, api_key)
 
     if env_var == "ANTHROPIC_API_KEY":
-        mocker.patch("src.llm.llm.Anthropic")
+        mocker.patch("llama_index.llms.anthropic.Anthropic")
     elif env_var == "OPENAI_API_KEY":
-        mocker.patch("src.llm.llm.OpenAI")
+        mocker.patch("llama_index.llms.openai.OpenAI")
     else:
-        mocker.patch("src.llm.llm.GoogleGenAI")
+        mocker.patch("llama_index.llms.google_genai.GoogleGenAI")
 
     llm = initialize_llm()
     assert llm is not None
@@ -151,7 +195,7 @@ def test_initialize_llm_with_various_key_formats(
 
 
 def test_check_drift_calls_llm_with_correct_parameters(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
 ) -> None:
     """Test check_drift calls LLM program with correct parameters."""
@@ -161,10 +205,8 @@ def test_check_drift_calls_llm_with_correct_parameters(
         rationale="Drift detected",
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = drift_result
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Code and documentation
     code = "def authenticate_user(): pass"
@@ -185,6 +227,32 @@ def test_check_drift_calls_llm_with_correct_parameters(
     assert result == drift_result
 
 
+@pytest.mark.parametrize("is_function_calling_model", [True, False])
+def test_check_drift_uses_tool_calling_when_supported(
+    mocker: MockerFixture,
+    sample_drift_check_no_drift: DocumentationDriftCheck,
+    is_function_calling_model: bool,
+) -> None:
+    """Test check_drift uses native tool calling only when the model supports it."""
+    function_calling_llm = mocker.MagicMock(spec=FunctionCallingLLM)
+    function_calling_llm.model = "gpt-4o-mini"
+    function_calling_llm.metadata.is_function_calling_model = is_function_calling_model
+    mock_function_program = mocker.patch("src.llm.llm.FunctionCallingProgram")
+    mock_text_program = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
+    for program_class in (mock_function_program, mock_text_program):
+        program_class.from_defaults.return_value.return_value = (
+            sample_drift_check_no_drift
+        )
+
+    result = check_drift(
+        llm=function_calling_llm, context="def func(): pass", current_doc="# Docs"
+    )
+
+    assert result == sample_drift_check_no_drift
+    assert mock_function_program.from_defaults.called is is_function_calling_model
+    assert mock_text_program.from_defaults.called is not is_function_calling_model
+
+
 # --- Tests for check_drift with caching ---
 
 
@@ -192,15 +260,13 @@ def test_check_drift_calls_llm_with_correct_parameters(
 
 
 def test_generate_doc_returns_structured_documentation(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_component_documentation: ModuleDocumentation,
 ) -> None:
     """Test generate_doc returns structured ModuleDocumentation."""
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_component_documentation
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: A code context for a payment module
     context = "def process_payment(): pass\ndef validate_payment(): pass"
@@ -222,15 +288,13 @@ def test_generate_doc_returns_structured_documentation(
 
 
 def test_generate_doc_without_human_intent(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_component_documentation: ModuleDocumentation,
 ) -> None:
     """Test generate_doc works without human intent provided."""
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_component_documentation
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: No human intent (config=None)
     context = "def authenticate(): pass"
@@ -250,26 +314,51 @@ def test_generate_doc_without_human_intent(
     assert result.purpose_and_scope
 
 
-@pytest.mark.parametrize(
-    "context,current_doc",
-    [
-        ("short context", "short doc"),
-        ("a" * 1000, "b" * 1000),
-        ("context with\nnewlines", "doc with\nnewlines"),
-    ],
-)
-def test_check_drift_handles_various_inputs(
+def test_generate_doc_without_config_passes_context_unchanged(
     mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
+    mock_llm_client: LLM,
+    sample_component_documentation: ModuleDocumentation,
+) -> None:
+    """Test generate_doc skips prompt assembly when no config is provided."""
+    mock_program, _ = mock_llm_program
+    mock_program.return_value = sample_component_documentation
+    mock_build_prompt = mocker.patch("src.llm.llm.build_generation_prompt")
+
+    generate_doc(
+        llm=mock_llm_client,
+        context="def authenticate(): pass",
+        output_model=ModuleDocumentation,
+        prompt_template=MODULE_GENERATION_PROMPT,
+    )
+
+    mock_build_prompt.assert_not_called()
+    mock_program.assert_called_once_with(
+        context="def authenticate(): pass", human_intent_section=""
+    )
+
+
+_A1000 = "a" * 1000
+_B1000 = "b" * 1000
+
+_DRIFT_CASES = [
+    pytest.param("short context", "short doc", id="short"),
+    pytest.param(_A1000, _B1000, id="1kB"),
+    pytest.param("context with\nnewlines", "doc with\nnewlines", id="newlines"),
+]
+
+
+@pytest.mark.parametrize("context,current_doc", _DRIFT_CASES)
+def test_check_drift_handles_various_inputs(
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
     context: str,
     current_doc: str,
 ) -> None:
     """Test check_drift handles various context and documentation inputs."""
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Checking drift with various inputs
     result = check_drift(llm=mock_llm_client, context=context, current_doc=current_doc)
@@ -281,15 +370,13 @@ def test_check_drift_handles_various_inputs(
 
 
 def test_check_drift_handles_none_documentation(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_with_drift: DocumentationDriftCheck,
 ) -> None:
     """Test check_drift handles None for current_doc (no documentation)."""
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_drift_check_with_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Some code context and no existing documentation
     context = "def new_feature(): pass"
@@ -310,7 +397,7 @@ def test_check_drift_handles_none_documentation(
 
 
 def test_check_drift_no_drift_for_helper_function_addition(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
 ) -> None:
     """Test that adding helper functions should NOT trigger drift (conservative)."""
@@ -321,10 +408,8 @@ def test_check_drift_no_drift_for_helper_function_addition(
         "_validate_input supports existing authenticate_user functionality.",
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = no_drift_result
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Code with a new private helper function
     code = """
@@ -348,7 +433,7 @@ def _validate_input(username, password):
 
 
 def test_check_drift_no_drift_for_refactoring(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
 ) -> None:
     """Test that code refactoring should NOT trigger drift (conservative)."""
@@ -359,10 +444,8 @@ def test_check_drift_no_drift_for_refactoring(
         "class to functions maintains the same purpose and functionality.",
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = no_drift_result
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Code refactored from class to functions (same purpose)
     code = """
@@ -385,7 +468,7 @@ Main functions: create_payment, process_payment."""
 
 
 def test_check_drift_requires_checklist_citation_when_drift_detected(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
 ) -> None:
     """Test that drift rationale cites specific checklist items."""
@@ -396,10 +479,8 @@ def test_check_drift_requires_checklist_citation_when_drift_detected(
         "is implemented but not documented.",
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = drift_result
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Code with new significant feature
     code = """
@@ -421,22 +502,20 @@ def refund_payment(): pass  # NEW user-facing feature
 @pytest.mark.parametrize(
     "context",
     [
-        "simple code",
-        "def func():\n    pass",
-        "import os\nimport sys\n\nclass Foo:\n    pass",
+        pytest.param("simple code", id="plain"),
+        pytest.param("def func():\n    pass", id="function"),
+        pytest.param("import os\nimport sys\n\nclass Foo:\n    pass", id="module"),
     ],
 )
 def test_generate_doc_handles_various_contexts(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_component_documentation: ModuleDocumentation,
     context: str,
 ) -> None:
     """Test generate_doc handles various code contexts."""
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_component_documentation
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Generating docs with various code contexts
     result = generate_doc(
@@ -453,16 +532,14 @@ def test_generate_doc_handles_various_contexts(
 
 
 def test_generate_doc_with_human_intent(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_component_documentation: ModuleDocumentation,
 ) -> None:
     """Test generate_doc includes human intent when provided."""
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_component_documentation
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Human intent with specific guidance
     human_intent = ModuleIntent(
@@ -489,16 +566,14 @@ def test_generate_doc_with_human_intent(
 
 
 def test_generate_doc_with_partial_human_intent(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_component_documentation: ModuleDocumentation,
 ) -> None:
     """Test generate_doc handles partial human intent."""
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_component_documentation
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Partial human intent (only some fields provided)
     human_intent = ModuleIntent(
@@ -521,11 +596,19 @@ def test_generate_doc_with_partial_human_intent(
     assert result.purpose_and_scope
 
 
+def test_generation_config_is_immutable() -> None:
+    """Test GenerationConfig rejects attribute assignment after construction."""
+    config = GenerationConfig(drift_rationale="New function added")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.drift_rationale = "Changed"  # type: ignore
+
+
 # --- Tests for fix_doc_incrementally() ---
 
 
 def test_fix_doc_incrementally_returns_structured_fixes(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
 ) -> None:
     """Test fix_doc_incrementally returns IncrementalDocumentationFix with changes."""
@@ -543,10 +626,8 @@ def test_fix_doc_incrementally_returns_structured_fixes(
         preserved_sections=["Architecture Overview", "Key Design Decisions"],
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = incremental_fix
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Current documentation and code context
     current_doc = "# Payment Module\n\n## Purpose\nHandles payment processing."
@@ -572,7 +653,7 @@ def test_fix_doc_incrementally_returns_structured_fixes(
 
 
 def test_fix_doc_incrementally_with_custom_prompts(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
 ) -> None:
     """Test fix_doc_incrementally includes custom prompts when provided."""
@@ -590,10 +671,8 @@ def test_fix_doc_incrementally_with_custom_prompts(
         preserved_sections=["Purpose & Scope"],
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = incremental_fix
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: Custom prompts configuration
     custom_prompts = CustomPrompts(
@@ -622,7 +701,7 @@ def test_fix_doc_incrementally_with_custom_prompts(
 
 
 def test_fix_doc_incrementally_without_optional_params(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
 ) -> None:
     """Test fix_doc_incrementally works without optional parameters."""
@@ -640,10 +719,8 @@ def test_fix_doc_incrementally_without_optional_params(
         preserved_sections=[],
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = incremental_fix
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Given: No custom prompts or doc type (minimal parameters)
     # When: Fixing documentation
@@ -661,7 +738,7 @@ def test_fix_doc_incrementally_without_optional_params(
 
 
 def test_fix_doc_incrementally_multiple_changes(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
 ) -> None:
     """Test fix_doc_incrementally handles multiple changes."""
@@ -691,10 +768,8 @@ def test_fix_doc_incrementally_multiple_changes(
         preserved_sections=["Architecture Overview", "Control Flow"],
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = incremental_fix
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Fixing documentation with multiple drift issues
     result = fix_doc_incrementally(
@@ -715,13 +790,13 @@ def test_fix_doc_incrementally_multiple_changes(
 # Tests for error recovery and resilience
 
 
-def test_check_drift_llm_api_error(mocker: MockerFixture, mock_llm_client: LLM) -> None:
+def test_check_drift_llm_api_error(
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
+) -> None:
     """Test check_drift handles LLM API errors gracefully."""
     # Mock LLM program to raise an exception
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.side_effect = Exception("API rate limit exceeded")
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Calling check_drift
     # Then: Should propagate the exception (caller should handle)
@@ -734,17 +809,15 @@ def test_check_drift_llm_api_error(mocker: MockerFixture, mock_llm_client: LLM)
 
 
 def test_check_drift_with_empty_context(
-    mocker: MockerFixture, mock_llm_client: LLM
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
 ) -> None:
     """Test check_drift handles empty context."""
     drift_check = DocumentationDriftCheck(
         drift_detected=False, rationale="No code to check"
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = drift_check
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Checking drift with empty context
     result = check_drift(llm=mock_llm_client, context="", current_doc="# Docs")
@@ -754,7 +827,7 @@ def test_check_drift_with_empty_context(
 
 
 def test_check_drift_with_very_large_context(
-    mocker: MockerFixture, mock_llm_client: LLM
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
 ) -> None:
     """Test check_drift handles very large code context."""
     # Create a large context (simulate large codebase)
@@ -764,10 +837,8 @@ def test_check_drift_with_very_large_context(
         drift_detected=True, rationale="Many new functions"
     )
 
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = drift_check
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Checking drift with large context
     result = check_drift(
@@ -780,13 +851,13 @@ def test_check_drift_with_very_large_context(
     assert mock_program.call_count == 1
 
 
-def test_generate_doc_llm_timeout(mocker: MockerFixture, mock_llm_client: LLM) -> None:
+def test_generate_doc_llm_timeout(
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
+) -> None:
     """Test generate_doc handles LLM timeout errors."""
     # Mock LLM program to simulate timeout
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.side_effect = TimeoutError("Request timeout")
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Generating documentation
     # Then: Should propagate timeout error
@@ -800,18 +871,16 @@ def test_generate_doc_llm_timeout(mocker: MockerFixture, mock_llm_client: LLM) -
 
 
 def test_generate_doc_invalid_response_structure(
-    mocker: MockerFixture, mock_llm_client: LLM
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
 ) -> None:
     """Test generate_doc handles invalid LLM response structure."""
     # Mock LLM program to return invalid data
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     # Simulate Pydantic validation error
     mock_program.side_effect = ValidationError.from_exception_data(
         "ModuleDocumentation",
         [{"type": "missing", "loc": ("purpose_and_scope",), "input": {}}],
     )
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Generating documentation with invalid response
     # Then: Should propagate validation error
@@ -825,14 +894,12 @@ def test_generate_doc_invalid_response_structure(
 
 
 def test_fix_doc_incrementally_llm_error(
-    mocker: MockerFixture, mock_llm_client: LLM
+    mock_llm_program: tuple[MockType, MockType], mock_llm_client: LLM
 ) -> None:
     """Test fix_doc_incrementally handles LLM errors."""
     # Mock LLM program to raise error
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.side_effect = RuntimeError("LLM service unavailable")
-    mock_program_class.from_defaults.return_value = mock_program
 
     # When: Fixing documentation
     # Then: Should propagate the error
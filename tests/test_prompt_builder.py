@@ -224,6 +224,20 @@ def test_build_custom_prompt_section_no_doc_type() -> None:
     assert "Focus on implementation." not in result  # No doc type specified
 
 
+def test_build_custom_prompt_section_reuses_result_for_equal_prompts() -> None:
+    """Test build_custom_prompt_section reuses the section for identical prompts."""
+    first = build_custom_prompt_section(
+        custom_prompts=CustomPrompts(global_prompt="Be concise."),
+        doc_type=DocType.MODULE_README,
+    )
+    second = build_custom_prompt_section(
+        custom_prompts=CustomPrompts(global_prompt="Be concise."),
+        doc_type=DocType.MODULE_README,
+    )
+
+    assert first is second
+
+
 # --- Tests for build_generation_prompt() ---
 
 
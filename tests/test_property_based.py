@@ -12,7 +12,7 @@ to avoid circular import issues.
 
 from hypothesis import HealthCheck, given, settings, strategies as st
 from llama_index.core.llms import LLM
-from pytest_mock import MockerFixture
+from pytest_mock import MockerFixture, MockType
 
 from src.cache import _generate_cache_key, _hash_content
 from src.llm import check_drift
@@ -261,7 +261,7 @@ def test_drift_check_handles_none_doc(
 
 
 def test_drift_check_with_empty_strings(
-    mocker: MockerFixture,
+    mock_llm_program: tuple[MockType, MockType],
     mock_llm_client: LLM,
     sample_drift_check_no_drift: DocumentationDriftCheck,
 ) -> None:
@@ -271,10 +271,8 @@ def test_drift_check_with_empty_strings(
     specific edge cases with empty strings.
     """
     # Mock the LLM program
-    mock_program_class = mocker.patch("src.llm.llm.LLMTextCompletionProgram")
-    mock_program = mocker.MagicMock()
+    mock_program, _ = mock_llm_program
     mock_program.return_value = sample_drift_check_no_drift
-    mock_program_class.from_defaults.return_value = mock_program
 
     # Test with empty context
     result1 = check_drift(llm=mock_llm_client, context="", current_doc="some doc")